@@ -1,370 +1,594 @@
+import atexit
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from itertools import chain
 import psycopg2
+from psycopg2 import pool
+from psycopg2.extras import execute_values
+from psycopg2.sql import SQL
 from rich.console import Console
-from rich.table import Table
+from rich.table import Column, Table
 from rich.prompt import Prompt, Confirm
 from datetime import datetime
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
 
 console = Console()
 
+# Point DB_HOST/DB_PORT at PgBouncer (e.g. port 6432) to pool server backends
 DB_PARAMS = {
-    "dbname": "music_app",
-    "user": "postgres",
-    "password": "123",
-    "host": "localhost",
-    "port": "5432"
+    "dbname": os.getenv("DB_NAME", "music_app"),
+    "user": os.getenv("DB_USER", "postgres"),
+    "password": os.getenv("DB_PASSWORD", "123"),
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": os.getenv("DB_PORT", "5432")
 }
 
+# PgBouncer in transaction pooling mode may run each transaction on a
+# different backend, so session-level PREPARE cannot be relied on
+TRANSACTION_POOLING = os.getenv("DB_TRANSACTION_POOLING") == "1"
+
+class PreparingConnection(psycopg2.extensions.connection):
+    # Remembers which server-side prepared statements exist in this session
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+# Connections are kept warm in a pool and reused across menu actions
+POOL = pool.ThreadedConnectionPool(minconn=1, maxconn=8,
+                                   connection_factory=PreparingConnection, **DB_PARAMS)
+atexit.register(POOL.closeall)
+
 def connect():
-    return psycopg2.connect(**DB_PARAMS)
+    return POOL.getconn()
 
-def create_tables():
-    queries = [
-        """
-        CREATE TABLE IF NOT EXISTS users (
-            id SERIAL PRIMARY KEY,
-            username VARCHAR(50) UNIQUE NOT NULL,
-            email VARCHAR(100) UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS artists (
-            id SERIAL PRIMARY KEY,
-            name VARCHAR(100) NOT NULL,
-            bio TEXT
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS albums (
-            id SERIAL PRIMARY KEY,
-            title VARCHAR(100) NOT NULL,
-            artist_id INTEGER REFERENCES artists(id),
-            release_date DATE
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS songs (
-            id SERIAL PRIMARY KEY,
-            title VARCHAR(100) NOT NULL,
-            album_id INTEGER REFERENCES albums(id),
-            duration INTEGER,
-            file_path TEXT NOT NULL
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS playlists (
-            id SERIAL PRIMARY KEY,
-            name VARCHAR(100) NOT NULL,
-            user_id INTEGER REFERENCES users(id)
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS playlist_songs (
-            playlist_id INTEGER REFERENCES playlists(id),
-            song_id INTEGER REFERENCES songs(id),
-            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (playlist_id, song_id)
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS play_history (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER REFERENCES users(id),
-            song_id INTEGER REFERENCES songs(id),
-            played_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS song_ratings (
-            user_id INTEGER REFERENCES users(id),
-            song_id INTEGER REFERENCES songs(id),
-            rating INTEGER CHECK (rating >= 1 AND rating <= 5),
-            PRIMARY KEY (user_id, song_id)
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS song_likes (
-            user_id INTEGER REFERENCES users(id),
-            song_id INTEGER REFERENCES songs(id),
-            liked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (user_id, song_id)
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS artist_follows (
-            user_id INTEGER REFERENCES users(id),
-            artist_id INTEGER REFERENCES artists(id),
-            followed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (user_id, artist_id)
-        );
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS song_comments (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER REFERENCES users(id),
-            song_id INTEGER REFERENCES songs(id),
-            comment TEXT NOT NULL,
-            commented_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """
-    ]
+def release(conn):
+    POOL.putconn(conn)
+
+@contextmanager
+def db_cursor(commit=False, name=None, itersize=2000, autocommit=False):
+    # Passing a name opens a server-side cursor that streams rows in batches.
+    # autocommit suits a block that issues one write statement: it is atomic
+    # on its own, so the implicit BEGIN and the COMMIT round trips are skipped
     conn = connect()
-    cur = conn.cursor()
-    for q in queries:
-        cur.execute(q)
-    conn.commit()
-    cur.close()
-    conn.close()
+    if autocommit:
+        conn.autocommit = True
+    cur = conn.cursor(name=name)
+    if name:
+        cur.itersize = itersize
+    try:
+        yield cur
+        if commit:
+            conn.commit()
+        if commit or autocommit:
+            # Any committed write may change what the listings show
+            _QCACHE.clear()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        if autocommit:
+            conn.autocommit = False
+        release(conn)
+
+@contextmanager
+def batch_step(cur=None):
+    # Without a cursor this is an ordinary committing db_cursor. Inside a
+    # batch the step runs under a savepoint, so a failure undoes only this
+    # step and the batch's earlier changes stay pending
+    if cur is None:
+        with db_cursor(commit=True) as cur:
+            yield cur
+        return
+    cur.execute("SAVEPOINT batch_step;")
+    try:
+        yield cur
+    except Exception:
+        cur.execute("ROLLBACK TO SAVEPOINT batch_step;")
+        raise
+    cur.execute("RELEASE SAVEPOINT batch_step;")
+
+# A menu batch holds its transaction open while the user reads and types,
+# so an abandoned one is cut off and a blocked one gives up instead of
+# waiting on locks indefinitely
+BATCH_IDLE_TIMEOUT = "5min"
+BATCH_LOCK_TIMEOUT = "5s"
+
+def _limit_batch(cur):
+    # SET LOCAL lasts until the transaction ends, so this is reapplied after
+    # every rollback
+    cur.execute(f"""
+        SET LOCAL idle_in_transaction_session_timeout = '{BATCH_IDLE_TIMEOUT}';
+        SET LOCAL lock_timeout = '{BATCH_LOCK_TIMEOUT}';
+    """)
+
+@contextmanager
+def menu_batch():
+    # Yields the cursor a menu's actions share, or None when
+    # DB_TRANSACTION_POOLING=1: a transaction left open between prompts
+    # would pin a PgBouncer server connection to this client, so there
+    # every action commits on its own instead
+    if TRANSACTION_POOLING:
+        yield None
+        return
+    # If the server ended the session (the idle timeout, say), the commit on
+    # leaving fails; report it here rather than let it escape the menu
+    try:
+        with db_cursor(commit=True) as cur:
+            _limit_batch(cur)
+            yield cur
+    except psycopg2.Error as e:
+        console.print(f"[red]Pending changes were lost: {e}[/red]")
+
+def discard_batch(cur, what):
+    if cur is None:
+        console.print(f"[yellow]{what.capitalize()} changes are saved as they are made.[/yellow]")
+        return
+    try:
+        cur.connection.rollback()
+        _limit_batch(cur)
+    except psycopg2.Error as e:
+        console.print(f"[red]Pending {what} changes were lost; leave this menu and reopen it: {e}[/red]")
+        return
+    console.print(f"[yellow]Pending {what} changes discarded.[/yellow]")
+
+def db_op(fn):
+    # Menu actions report database errors here instead of each wrapping its
+    # body in the same try/except; db_cursor has already rolled back
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except psycopg2.Error as e:
+            console.print(f"[red]Error: {e}[/red]")
+    return wrapper
+
+# Listing queries are re-run before almost every update/delete, so their
+# rows are kept for a few seconds keyed on (sql, params)
+QUERY_CACHE_TTL = 10
+_QCACHE = {}
+
+def cached_fetchall(sql, params=(), cur=None):
+    # On a miss, run on the caller's cursor if given, else borrow a connection
+    key = (sql, params)
+    hit = _QCACHE.get(key)
+    if hit and time.monotonic() - hit[0] < QUERY_CACHE_TTL:
+        return hit[1]
+    if cur is None:
+        with db_cursor() as cur:
+            cur.execute(sql, params or None)
+            rows = cur.fetchall()
+    else:
+        cur.execute(sql, params or None)
+        rows = cur.fetchall()
+    _QCACHE[key] = (time.monotonic(), rows)
+    return rows
+
+# One background worker warms the listing cache on its own pooled
+# connection, so a listing needed after the next prompt is usually
+# already fetched while the user is still reading and typing
+_PREFETCHER = ThreadPoolExecutor(max_workers=1)
+
+def prefetch(sql, params=()):
+    # Failures are ignored here; the real call reports them
+    _PREFETCHER.submit(cached_fetchall, sql, params)
+
+def execute_prepared(cur, name, sql, params):
+    if TRANSACTION_POOLING:
+        # Each $n appears once and in order, so it maps onto a plain %s
+        cur.execute(re.sub(r"\$\d+", "%s", sql), params)
+        return
+    # PREPARE the statement once per pooled connection, then only EXECUTE it.
+    # Every statement sent here hits a primary or unique key, so the generic
+    # plan PostgreSQL may settle on is as good as a custom one and
+    # plan_cache_mode stays at its default
+    conn = cur.connection
+    if name not in conn.prepared:
+        cur.execute(f"PREPARE {name} AS {sql}")
+        conn.prepared.add(name)
+    placeholders = ", ".join(["%s"] * len(params))
+    cur.execute(f"EXECUTE {name} ({placeholders});", params)
+
+def _as_int(value):
+    # IDs are bound as integers so PostgreSQL gets a correctly typed parameter
+    try:
+        return int(value)
+    except ValueError:
+        console.print(f"[red]Invalid ID: {value}[/red]")
+        return None
+
+def ask_int(prompt, default=...):
+    # None means the answer was not a whole number (and the user was told);
+    # a blank answer to an optional prompt (default "") comes back as ""
+    value = Prompt.ask(prompt, default=default)
+    return value if value == "" else _as_int(value)
+
+def pick(show, prompt):
+    # Users who already know the ID can type it straight away; a blank
+    # answer lists the rows first
+    value = Prompt.ask(f"{prompt} (blank to list)", default="")
+    if not value:
+        show()
+        value = Prompt.ask(prompt)
+    return _as_int(value)
+
+def _fmt(value):
+    return str(value) if value else "N/A"
+
+# ========== SCHEMA ==========
+# Tables created before ON DELETE CASCADE was added still carry the old
+# foreign keys, so redeclare those (and only those) under PostgreSQL's
+# default names. artist_follows.artist_id is left restricting on purpose
+_CASCADE_FKS = (
+    ("playlists", "user_id", "users"),
+    ("playlist_songs", "playlist_id", "playlists"),
+    ("playlist_songs", "song_id", "songs"),
+    ("play_history", "user_id", "users"),
+    ("play_history", "song_id", "songs"),
+    ("song_ratings", "user_id", "users"),
+    ("song_ratings", "song_id", "songs"),
+    ("song_likes", "user_id", "users"),
+    ("song_likes", "song_id", "songs"),
+    ("artist_follows", "user_id", "users"),
+    ("song_comments", "user_id", "users"),
+    ("song_comments", "song_id", "songs"),
+)
+
+_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id SERIAL PRIMARY KEY,
+        username VARCHAR(50) UNIQUE NOT NULL,
+        email VARCHAR(100) UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS artists (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        bio TEXT
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS albums (
+        id SERIAL PRIMARY KEY,
+        title VARCHAR(100) NOT NULL,
+        artist_id INTEGER REFERENCES artists(id),
+        release_date DATE
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS songs (
+        id SERIAL PRIMARY KEY,
+        title VARCHAR(100) NOT NULL,
+        album_id INTEGER REFERENCES albums(id),
+        duration INTEGER,
+        file_path TEXT NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS playlists (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS playlist_songs (
+        playlist_id INTEGER REFERENCES playlists(id) ON DELETE CASCADE,
+        song_id INTEGER REFERENCES songs(id) ON DELETE CASCADE,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (playlist_id, song_id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS play_history (
+        id SERIAL PRIMARY KEY,
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+        song_id INTEGER REFERENCES songs(id) ON DELETE CASCADE,
+        played_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS song_ratings (
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+        song_id INTEGER REFERENCES songs(id) ON DELETE CASCADE,
+        rating SMALLINT CHECK (rating >= 1 AND rating <= 5),
+        PRIMARY KEY (user_id, song_id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS song_likes (
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+        song_id INTEGER REFERENCES songs(id) ON DELETE CASCADE,
+        liked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (user_id, song_id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS artist_follows (
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+        artist_id INTEGER REFERENCES artists(id),
+        followed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (user_id, artist_id)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS song_comments (
+        id SERIAL PRIMARY KEY,
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+        song_id INTEGER REFERENCES songs(id) ON DELETE CASCADE,
+        comment TEXT NOT NULL,
+        commented_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    # Foreign-key columns not already leading a primary key, so joins and
+    # cascading deletes use index lookups instead of sequential scans
+    """
+    CREATE INDEX IF NOT EXISTS idx_albums_artist ON albums(artist_id);
+    CREATE INDEX IF NOT EXISTS idx_songs_album ON songs(album_id);
+    CREATE INDEX IF NOT EXISTS idx_songs_title ON songs(title, id);
+    CREATE INDEX IF NOT EXISTS idx_playlists_user ON playlists(user_id);
+    CREATE INDEX IF NOT EXISTS idx_playlist_songs_song ON playlist_songs(song_id);
+    CREATE INDEX IF NOT EXISTS idx_play_history_song ON play_history(song_id);
+    CREATE INDEX IF NOT EXISTS idx_artist_follows_artist ON artist_follows(artist_id);
+    CREATE INDEX IF NOT EXISTS idx_song_comments_user ON song_comments(user_id);
+    """,
+    # The listings filter on one column and sort on another, so these serve
+    # both the lookup and the ORDER BY. They replace the single-column
+    # indexes on the same leading key
+    """
+    DROP INDEX IF EXISTS idx_play_history_user;
+    DROP INDEX IF EXISTS idx_song_ratings_song;
+    DROP INDEX IF EXISTS idx_song_likes_song;
+    DROP INDEX IF EXISTS idx_song_comments_song;
+    CREATE INDEX IF NOT EXISTS idx_playlist_songs_added ON playlist_songs(playlist_id, added_at);
+    CREATE INDEX IF NOT EXISTS idx_play_history_user_played ON play_history(user_id, played_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_song_ratings_song_rating ON song_ratings(song_id, rating DESC);
+    CREATE INDEX IF NOT EXISTS idx_song_likes_song_liked ON song_likes(song_id, liked_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_artist_follows_user_followed ON artist_follows(user_id, followed_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_song_comments_song_commented ON song_comments(song_id, commented_at DESC);
+    """,
+    # A rating is 1-5, so older tables created it wider than it needs to be
+    """
+    DO $$ BEGIN
+        IF EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_schema = current_schema() AND table_name = 'song_ratings'
+                     AND column_name = 'rating' AND data_type <> 'smallint') THEN
+            ALTER TABLE song_ratings ALTER COLUMN rating TYPE smallint;
+        END IF;
+    END $$;
+    """,
+) + tuple(f"""
+    DO $$ BEGIN
+        IF EXISTS (SELECT 1 FROM pg_constraint
+                   WHERE conrelid = '{table}'::regclass
+                     AND conname = '{table}_{column}_fkey' AND confdeltype <> 'c') THEN
+            ALTER TABLE {table}
+                DROP CONSTRAINT {table}_{column}_fkey,
+                ADD CONSTRAINT {table}_{column}_fkey
+                    FOREIGN KEY ({column}) REFERENCES {ref}(id) ON DELETE CASCADE;
+        END IF;
+    END $$;
+    """ for table, column, ref in _CASCADE_FKS)
+
+# Every statement already ends in ';', so the whole schema is composed once
+# and goes out as a single multi-statement execute
+_DDL_JOINED = SQL("\n").join(SQL(q) for q in _DDL)
+
+def create_tables():
+    with db_cursor(commit=True) as cur:
+        cur.execute(_DDL_JOINED)
     console.print("[green]All tables created successfully![/green]")
 
-def menu():
-    table = Table(title="🎵 Music App CLI Menu 🎵")
+def _listing(title, columns):
+    # Listing columns are defined once at module level; Column.copy() gives
+    # each call fresh, empty columns so rows never leak between renders
+    return Table(*(column.copy() for column in columns), title=title)
+
+def _build_menu(title, options):
+    table = Table(title=title)
     table.add_column("Option", style="cyan", no_wrap=True)
     table.add_column("Action", style="magenta")
-    actions = [
-        ("1", "Manage Users"),
-        ("2", "Manage Artists"),
-        ("3", "Manage Albums"),
-        ("4", "Manage Songs"),
-        ("5", "Manage Playlists"),
-        ("6", "Manage Playlist Songs"),
-        ("7", "View Play History"),
-        ("8", "Manage Song Ratings"),
-        ("9", "Create Tables"),
-        ("10", "Manage Song Likes"),
-        ("11", "Manage Artist Follows"),
-        ("12", "Manage Song Comments"),
-        ("0", "Exit")
-    ]
-    for opt, desc in actions:
+    for opt, desc in options:
         table.add_row(opt, desc)
-    console.print(table)
+    return table
 
+def _choice_prompt(count, start=1):
+    return Prompt("Choose an option", choices=[str(i) for i in range(start, count + 1)])
 
-# ========== USER CRUD ==========
-def manage_users():
+# Option prompts are built once and called on every loop, rather than
+# having Prompt.ask construct a new one per keypress
+CHOOSE_1_4 = _choice_prompt(4)
+CHOOSE_1_5 = _choice_prompt(5)
+CHOOSE_1_6 = _choice_prompt(6)
+CHOOSE_MAIN = _choice_prompt(12, start=0)
+
+# Menus are static, so they are built once and reprinted on every loop
+MAIN_MENU = _build_menu("🎵 Music App CLI Menu 🎵", [
+    ("1", "Manage Users"),
+    ("2", "Manage Artists"),
+    ("3", "Manage Albums"),
+    ("4", "Manage Songs"),
+    ("5", "Manage Playlists"),
+    ("6", "Manage Playlist Songs"),
+    ("7", "View Play History"),
+    ("8", "Manage Song Ratings"),
+    ("9", "Create Tables"),
+    ("10", "Manage Song Likes"),
+    ("11", "Manage Artist Follows"),
+    ("12", "Manage Song Comments"),
+    ("0", "Exit")
+])
+
+def run_menu(menu, choose, actions):
+    # Options without an action (Back / Exit) leave the menu
     while True:
-        table = Table(title="👥 User Management")
-        table.add_column("Option", style="cyan")
-        table.add_column("Action", style="magenta")
-        table.add_row("1", "Add User")
-        table.add_row("2", "View All Users")
-        table.add_row("3", "Update User")
-        table.add_row("4", "Delete User")
-        table.add_row("5", "Back to Main Menu")
-        console.print(table)
-        
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4", "5"])
-        
-        if choice == "1":
-            add_user()
-        elif choice == "2":
-            show_users()
-        elif choice == "3":
-            update_user()
-        elif choice == "4":
-            delete_user()
-        elif choice == "5":
+        console.print(menu)
+        action = actions.get(choose())
+        if action is None:
             break
+        action()
+
 
+# ========== USER CRUD ==========
+USER_MENU = _build_menu("👥 User Management", [
+    ("1", "Add User"),
+    ("2", "View All Users"),
+    ("3", "Update User"),
+    ("4", "Delete User"),
+    ("5", "Back to Main Menu")
+])
+
+def manage_users():
+    run_menu(USER_MENU, CHOOSE_1_5, {
+        "1": add_user,
+        "2": show_users,
+        "3": update_user,
+        "4": delete_user,
+    })
+        
+@db_op
 def add_user():
     username = Prompt.ask("Enter username")
     email = Prompt.ask("Enter email")
     password = Prompt.ask("Enter password", password=True)
     
-    try:
-        conn = connect()
-        cur = conn.cursor()
+    with db_cursor(commit=True) as cur:
         cur.execute("""
             INSERT INTO users (username, email, password)
             VALUES (%s, %s, %s);
         """, (username, email, password))
-        conn.commit()
-        console.print(f"[green]User '{username}' added successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    console.print(f"[green]User '{username}' added successfully![/green]")
 
-def show_users():
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("SELECT id, username, email, created_at FROM users ORDER BY id;")
-        users = cur.fetchall()
-        
-        table = Table(title="👥 Users")
-        table.add_column("ID", justify="right")
-        table.add_column("Username")
-        table.add_column("Email")
-        table.add_column("Created At")
-        
-        for user in users:
-            table.add_row(str(user[0]), user[1], user[2], str(user[3]))
-        console.print(table)
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+USER_COLUMNS = (
+    Column("ID", justify="right"),
+    Column("Username"),
+    Column("Email"),
+    Column("Created At"),
+)
+        
+@db_op
+def show_users(cur=None):
+    users = cached_fetchall("SELECT id, username, email, created_at FROM users ORDER BY id;", cur=cur)
+        
+    table = _listing("👥 Users", USER_COLUMNS)
+
+    add_row = table.add_row
+    for user in users:
+        add_row(*map(_fmt, user))
+    console.print(table)
 
+@db_op
 def update_user():
-    show_users()
-    user_id = Prompt.ask("Enter ID of user to update")
+    user_id = pick(show_users, "Enter ID of user to update")
+    if user_id is None:
+        return
+    username = Prompt.ask("Enter new username (leave blank to keep current)", default="")
+    email = Prompt.ask("Enter new email (leave blank to keep current)", default="")
+    password = Prompt.ask("Enter new password (leave blank to keep current)", password=True, default="")
     
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
-        # Get current user data
-        cur.execute("SELECT username, email FROM users WHERE id = %s;", (user_id,))
+    with db_cursor(commit=True) as cur:
+        # NULL keeps the current value; RETURNING reports the final state
+        execute_prepared(cur, "upd_user", """
+            UPDATE users
+            SET username = COALESCE($1, username),
+                email = COALESCE($2, email),
+                password = COALESCE($3, password)
+            WHERE id = $4
+            RETURNING username, email
+        """, (username or None, email or None, password or None, user_id))
         user = cur.fetchone()
         
-        if not user:
-            console.print("[red]User not found![/red]")
-            return
-            
-        current_username, current_email = user
-        
-        username = Prompt.ask(f"Enter new username (current: {current_username})", default=current_username)
-        email = Prompt.ask(f"Enter new email (current: {current_email})", default=current_email)
-        password = Prompt.ask("Enter new password (leave blank to keep current)", password=True, default="")
-        
-        if password:
-            cur.execute("""
-                UPDATE users 
-                SET username = %s, email = %s, password = %s 
-                WHERE id = %s;
-            """, (username, email, password, user_id))
-        else:
-            cur.execute("""
-                UPDATE users 
-                SET username = %s, email = %s 
-                WHERE id = %s;
-            """, (username, email, user_id))
+    if user:
+        console.print(f"[green]User {user_id} updated successfully! ({user[0]}, {user[1]})[/green]")
+    else:
+        console.print("[red]User not found![/red]")
             
-        conn.commit()
-        console.print(f"[green]User {user_id} updated successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
-
+@db_op
 def delete_user():
-    show_users()
-    user_id = Prompt.ask("Enter ID of user to delete")
+    user_id = pick(show_users, "Enter ID of user to delete")
+    if user_id is None:
+        return
     
     if not Confirm.ask(f"[red]Are you sure you want to delete user {user_id}?[/red]"):
         return
         
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
-        # First delete dependent records
-        cur.execute("DELETE FROM playlists WHERE user_id = %s;", (user_id,))
-        cur.execute("DELETE FROM play_history WHERE user_id = %s;", (user_id,))
-        cur.execute("DELETE FROM song_ratings WHERE user_id = %s;", (user_id,))
-        
-        # Then delete the user
+    with db_cursor(autocommit=True) as cur:
+        # Dependent records are removed by ON DELETE CASCADE within
+        # this one statement
         cur.execute("DELETE FROM users WHERE id = %s;", (user_id,))
-        conn.commit()
+        deleted = cur.rowcount
         
-        if cur.rowcount > 0:
-            console.print(f"[green]User {user_id} deleted successfully![/green]")
-        else:
-            console.print("[red]User not found![/red]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-        conn.rollback()
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    if deleted > 0:
+        console.print(f"[green]User {user_id} deleted successfully![/green]")
+    else:
+        console.print("[red]User not found![/red]")
 
 # ========== ARTIST CRUD ==========
-def manage_artists():
-    while True:
-        table = Table(title="🎤 Artist Management")
-        table.add_column("Option", style="cyan")
-        table.add_column("Action", style="magenta")
-        table.add_row("1", "Add Artist")
-        table.add_row("2", "View All Artists")
-        table.add_row("3", "Update Artist")
-        table.add_row("4", "Delete Artist")
-        table.add_row("5", "Back to Main Menu")
-        console.print(table)
-        
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4", "5"])
-        
-        if choice == "1":
-            add_artist()
-        elif choice == "2":
-            show_artists()
-        elif choice == "3":
-            update_artist()
-        elif choice == "4":
-            delete_artist()
-        elif choice == "5":
-            break
+ARTIST_MENU = _build_menu("🎤 Artist Management", [
+    ("1", "Add Artist"),
+    ("2", "View All Artists"),
+    ("3", "Update Artist"),
+    ("4", "Delete Artist"),
+    ("5", "Back to Main Menu")
+])
 
+def manage_artists():
+    run_menu(ARTIST_MENU, CHOOSE_1_5, {
+        "1": add_artist,
+        "2": show_artists,
+        "3": update_artist,
+        "4": delete_artist,
+    })
+        
+@db_op
 def add_artist():
     name = Prompt.ask("Enter artist name")
     bio = Prompt.ask("Enter artist bio (optional)", default="")
     
-    try:
-        conn = connect()
-        cur = conn.cursor()
+    with db_cursor(commit=True) as cur:
         cur.execute("""
             INSERT INTO artists (name, bio)
             VALUES (%s, %s);
         """, (name, bio))
-        conn.commit()
-        console.print(f"[green]Artist '{name}' added successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    console.print(f"[green]Artist '{name}' added successfully![/green]")
 
-def show_artists():
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("SELECT id, name, bio FROM artists ORDER BY name;")
-        artists = cur.fetchall()
+ARTISTS_SQL = "SELECT id, name, bio FROM artists ORDER BY name;"
         
-        table = Table(title="🎤 Artists")
-        table.add_column("ID", justify="right")
-        table.add_column("Name")
-        table.add_column("Bio")
+ARTIST_COLUMNS = (
+    Column("ID", justify="right"),
+    Column("Name"),
+    Column("Bio"),
+)
         
-        for artist in artists:
-            bio = artist[2] if artist[2] else "N/A"
-            table.add_row(str(artist[0]), artist[1], bio)
-        console.print(table)
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+@db_op
+def show_artists(cur=None):
+    artists = cached_fetchall(ARTISTS_SQL, cur=cur)
+
+    table = _listing("🎤 Artists", ARTIST_COLUMNS)
+
+    add_row = table.add_row
+    for artist in artists:
+        add_row(*map(_fmt, artist))
+    console.print(table)
 
+@db_op
 def update_artist():
-    show_artists()
-    artist_id = Prompt.ask("Enter ID of artist to update")
+    artist_id = pick(show_artists, "Enter ID of artist to update")
+    if artist_id is None:
+        return
     
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
+    with db_cursor(commit=True) as cur:
         # Get current artist data
         cur.execute("SELECT name, bio FROM artists WHERE id = %s;", (artist_id,))
         artist = cur.fetchone()
@@ -376,155 +600,115 @@ def update_artist():
         current_name, current_bio = artist
         
         name = Prompt.ask(f"Enter new name (current: {current_name})", default=current_name)
-        bio = Prompt.ask(f"Enter new bio (current: {current_bio if current_bio else 'N/A'})", 
+        bio = Prompt.ask(f"Enter new bio (current: {current_bio if current_bio else 'N/A'})",
                          default=current_bio if current_bio else "")
         
-        cur.execute("""
-            UPDATE artists 
-            SET name = %s, bio = %s 
-            WHERE id = %s;
+        execute_prepared(cur, "upd_artist", """
+            UPDATE artists
+            SET name = $1, bio = $2
+            WHERE id = $3
         """, (name, bio, artist_id))
+    console.print(f"[green]Artist {artist_id} updated successfully![/green]")
             
-        conn.commit()
-        console.print(f"[green]Artist {artist_id} updated successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
-
+@db_op
 def delete_artist():
-    show_artists()
-    artist_id = Prompt.ask("Enter ID of artist to delete")
+    artist_id = pick(show_artists, "Enter ID of artist to delete")
+    if artist_id is None:
+        return
     
     if not Confirm.ask(f"[red]Are you sure you want to delete artist {artist_id}?[/red]"):
         return
         
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
-        # First check if artist has albums
-        cur.execute("SELECT COUNT(*) FROM albums WHERE artist_id = %s;", (artist_id,))
-        album_count = cur.fetchone()[0]
-        
-        if album_count > 0:
-            console.print("[red]Cannot delete artist with existing albums![/red]")
-            return
-            
-        # Delete the artist
-        cur.execute("DELETE FROM artists WHERE id = %s;", (artist_id,))
-        conn.commit()
-        
-        if cur.rowcount > 0:
-            console.print(f"[green]Artist {artist_id} deleted successfully![/green]")
-        else:
-            console.print("[red]Artist not found![/red]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-        conn.rollback()
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    with db_cursor(autocommit=True) as cur:
+        # Delete only if the artist has no albums, and report which
+        # case applied, in a single statement
+        cur.execute("""
+            WITH deleted AS (
+                DELETE FROM artists
+                WHERE id = %(id)s
+                  AND NOT EXISTS (SELECT 1 FROM albums WHERE artist_id = artists.id)
+                RETURNING id
+            )
+            SELECT EXISTS (SELECT 1 FROM deleted),
+                   EXISTS (SELECT 1 FROM albums WHERE artist_id = %(id)s);
+        """, {"id": artist_id})
+        deleted, has_albums = cur.fetchone()
+        
+    if deleted:
+        console.print(f"[green]Artist {artist_id} deleted successfully![/green]")
+    elif has_albums:
+        console.print("[red]Cannot delete artist with existing albums![/red]")
+    else:
+        console.print("[red]Artist not found![/red]")
 
 # ========== ALBUM CRUD ==========
-def manage_albums():
-    while True:
-        table = Table(title="💿 Album Management")
-        table.add_column("Option", style="cyan")
-        table.add_column("Action", style="magenta")
-        table.add_row("1", "Add Album")
-        table.add_row("2", "View All Albums")
-        table.add_row("3", "Update Album")
-        table.add_row("4", "Delete Album")
-        table.add_row("5", "Back to Main Menu")
-        console.print(table)
-        
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4", "5"])
-        
-        if choice == "1":
-            add_album()
-        elif choice == "2":
-            show_albums()
-        elif choice == "3":
-            update_album()
-        elif choice == "4":
-            delete_album()
-        elif choice == "5":
-            break
+ALBUM_MENU = _build_menu("💿 Album Management", [
+    ("1", "Add Album"),
+    ("2", "View All Albums"),
+    ("3", "Update Album"),
+    ("4", "Delete Album"),
+    ("5", "Back to Main Menu")
+])
 
+def manage_albums():
+    run_menu(ALBUM_MENU, CHOOSE_1_5, {
+        "1": add_album,
+        "2": show_albums,
+        "3": update_album,
+        "4": delete_album,
+    })
+        
+@db_op
 def add_album():
     show_artists()
-    artist_id = Prompt.ask("Enter artist ID for the album")
+    artist_id = ask_int("Enter artist ID for the album")
+    if artist_id is None:
+        return
     title = Prompt.ask("Enter album title")
     release_date = Prompt.ask("Enter release date (YYYY-MM-DD)", default="")
     
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
-        if release_date:
-            cur.execute("""
-                INSERT INTO albums (title, artist_id, release_date)
-                VALUES (%s, %s, %s);
-            """, (title, artist_id, release_date))
-        else:
-            cur.execute("""
-                INSERT INTO albums (title, artist_id)
-                VALUES (%s, %s);
-            """, (title, artist_id))
+    with db_cursor(commit=True) as cur:
+        # A blank release date becomes NULL on the server
+        cur.execute("""
+            INSERT INTO albums (title, artist_id, release_date)
+            VALUES (%s, %s, NULLIF(%s, '')::date);
+        """, (title, artist_id, release_date))
+    console.print(f"[green]Album '{title}' added successfully![/green]")
+        
+ALBUM_COLUMNS = (
+    Column("ID", justify="right"),
+    Column("Title"),
+    Column("Artist"),
+    Column("Release Date"),
+)
             
-        conn.commit()
-        console.print(f"[green]Album '{title}' added successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+@db_op
+def show_albums(cur=None):
+    albums = cached_fetchall("""
+        SELECT a.id, a.title, ar.name, a.release_date
+        FROM albums a
+        JOIN artists ar ON a.artist_id = ar.id
+        ORDER BY a.title;
+    """, cur=cur)
 
-def show_albums():
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT a.id, a.title, ar.name, a.release_date 
-            FROM albums a
-            JOIN artists ar ON a.artist_id = ar.id
-            ORDER BY a.title;
-        """)
-        albums = cur.fetchall()
+    table = _listing("💿 Albums", ALBUM_COLUMNS)
         
-        table = Table(title="💿 Albums")
-        table.add_column("ID", justify="right")
-        table.add_column("Title")
-        table.add_column("Artist")
-        table.add_column("Release Date")
+    add_row = table.add_row
+    for album in albums:
+        add_row(*map(_fmt, album))
+    console.print(table)
         
-        for album in albums:
-            release_date = str(album[3]) if album[3] else "N/A"
-            table.add_row(str(album[0]), album[1], album[2], release_date)
-        console.print(table)
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
-
+@db_op
 def update_album():
-    show_albums()
-    album_id = Prompt.ask("Enter ID of album to update")
-    
-    try:
-        conn = connect()
-        cur = conn.cursor()
+    # One connection serves the listings, the lookup and the update
+    with db_cursor(commit=True) as cur:
+        album_id = pick(lambda: show_albums(cur), "Enter ID of album to update")
+        if album_id is None:
+            return
         
         # Get current album data
         cur.execute("""
-            SELECT a.title, a.artist_id, ar.name, a.release_date 
+            SELECT a.title, ar.name, a.release_date, a.artist_id
             FROM albums a
             JOIN artists ar ON a.artist_id = ar.id
             WHERE a.id = %s;
@@ -535,162 +719,175 @@ def update_album():
             console.print("[red]Album not found![/red]")
             return
             
-        current_title, current_artist_id, current_artist_name, current_release_date = album
+        current_title, current_artist_name, current_release_date, current_artist_id = album
         
         title = Prompt.ask(f"Enter new title (current: {current_title})", default=current_title)
         
         # Show artists and allow change
-        show_artists()
-        artist_id = Prompt.ask(
-            f"Enter new artist ID (current: {current_artist_id} - {current_artist_name})", 
+        show_artists(cur)
+        artist_id = ask_int(
+            f"Enter new artist ID (current: {current_artist_id} - {current_artist_name})",
             default=str(current_artist_id))
+        if artist_id is None:
+            return
         
         release_date = Prompt.ask(
-            f"Enter new release date (current: {current_release_date if current_release_date else 'N/A'})", 
+            f"Enter new release date (current: {current_release_date if current_release_date else 'N/A'})",
             default=str(current_release_date) if current_release_date else "")
         
-        cur.execute("""
-            UPDATE albums 
-            SET title = %s, artist_id = %s, release_date = %s
-            WHERE id = %s;
+        execute_prepared(cur, "upd_album", """
+            UPDATE albums
+            SET title = $1, artist_id = $2, release_date = $3
+            WHERE id = $4
         """, (title, artist_id, release_date if release_date else None, album_id))
+        updated = cur.rowcount
             
-        conn.commit()
+    if updated > 0:
         console.print(f"[green]Album {album_id} updated successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    else:
+        console.print("[red]Album not found![/red]")
 
+@db_op
 def delete_album():
-    show_albums()
-    album_id = Prompt.ask("Enter ID of album to delete")
+    album_id = pick(show_albums, "Enter ID of album to delete")
+    if album_id is None:
+        return
     
     if not Confirm.ask(f"[red]Are you sure you want to delete album {album_id}?[/red]"):
         return
         
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
-        # First check if album has songs
-        cur.execute("SELECT COUNT(*) FROM songs WHERE album_id = %s;", (album_id,))
-        song_count = cur.fetchone()[0]
-        
-        if song_count > 0:
-            console.print("[red]Cannot delete album with existing songs![/red]")
-            return
-            
-        # Delete the album
-        cur.execute("DELETE FROM albums WHERE id = %s;", (album_id,))
-        conn.commit()
-        
-        if cur.rowcount > 0:
-            console.print(f"[green]Album {album_id} deleted successfully![/green]")
-        else:
-            console.print("[red]Album not found![/red]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-        conn.rollback()
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    with db_cursor(autocommit=True) as cur:
+        # Delete only if the album has no songs, and report which
+        # case applied, in a single statement
+        cur.execute("""
+            WITH deleted AS (
+                DELETE FROM albums
+                WHERE id = %(id)s
+                  AND NOT EXISTS (SELECT 1 FROM songs WHERE album_id = albums.id)
+                RETURNING id
+            )
+            SELECT EXISTS (SELECT 1 FROM deleted),
+                   EXISTS (SELECT 1 FROM songs WHERE album_id = %(id)s);
+        """, {"id": album_id})
+        deleted, has_songs = cur.fetchone()
+        
+    if deleted:
+        console.print(f"[green]Album {album_id} deleted successfully![/green]")
+    elif has_songs:
+        console.print("[red]Cannot delete album with existing songs![/red]")
+    else:
+        console.print("[red]Album not found![/red]")
 
 # ========== SONG CRUD ==========
-def manage_songs():
-    while True:
-        table = Table(title="🎵 Song Management")
-        table.add_column("Option", style="cyan")
-        table.add_column("Action", style="magenta")
-        table.add_row("1", "Add Song")
-        table.add_row("2", "View All Songs")
-        table.add_row("3", "Update Song")
-        table.add_row("4", "Delete Song")
-        table.add_row("5", "Back to Main Menu")
-        console.print(table)
-        
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4", "5"])
-        
-        if choice == "1":
-            add_song()
-        elif choice == "2":
-            show_songs()
-        elif choice == "3":
-            update_song()
-        elif choice == "4":
-            delete_song()
-        elif choice == "5":
-            break
+SONG_MENU = _build_menu("🎵 Song Management", [
+    ("1", "Add Song"),
+    ("2", "View All Songs"),
+    ("3", "Update Song"),
+    ("4", "Delete Song"),
+    ("5", "Import Songs from CSV"),
+    ("6", "Back to Main Menu")
+])
 
+def manage_songs():
+    run_menu(SONG_MENU, CHOOSE_1_6, {
+        "1": add_song,
+        "2": browse_songs,
+        "3": update_song,
+        "4": delete_song,
+        "5": import_songs,
+    })
+        
+@db_op
 def add_song():
-    show_albums()
-    album_id = Prompt.ask("Enter album ID for the song")
-    title = Prompt.ask("Enter song title")
-    duration = Prompt.ask("Enter song duration in seconds", default="0")
-    file_path = Prompt.ask("Enter file path for the song")
-    
-    try:
-        conn = connect()
-        cur = conn.cursor()
+    with db_cursor(commit=True) as cur:
+        show_albums(cur)
+        album_id = ask_int("Enter album ID for the song")
+        if album_id is None:
+            return
+        title = Prompt.ask("Enter song title")
+        duration = Prompt.ask("Enter song duration in seconds", default="")
+        file_path = Prompt.ask("Enter file path for the song")
+        
+        # A blank duration becomes NULL on the server
         cur.execute("""
             INSERT INTO songs (title, album_id, duration, file_path)
-            VALUES (%s, %s, %s, %s);
-        """, (title, album_id, int(duration), file_path))
-        conn.commit()
-        console.print(f"[green]Song '{title}' added successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+            VALUES (%s, %s, NULLIF(%s, '')::int, %s);
+        """, (title, album_id, duration, file_path))
+    console.print(f"[green]Song '{title}' added successfully![/green]")
+
+def bulk_add_songs(rows):
+    # rows are (title, album_id, duration, file_path) tuples, sent as
+    # multi-row INSERTs of up to 1000 rows each
+    with db_cursor(commit=True) as cur:
+        execute_values(cur, """
+            INSERT INTO songs (title, album_id, duration, file_path)
+            VALUES %s;
+        """, rows, page_size=1000)
 
-def show_songs():
+@db_op
+def import_songs():
+    csv_path = Prompt.ask("Enter path of CSV file (title, album_id, duration, file_path)")
+    
     try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT s.id, s.title, al.title, ar.name, s.duration, s.file_path 
-            FROM songs s
-            JOIN albums al ON s.album_id = al.id
-            JOIN artists ar ON al.artist_id = ar.id
-            ORDER BY s.title;
-        """)
-        songs = cur.fetchall()
-        
-        table = Table(title="🎵 Songs")
-        table.add_column("ID", justify="right")
-        table.add_column("Title")
-        table.add_column("Album")
-        table.add_column("Artist")
-        table.add_column("Duration (sec)")
-        table.add_column("File Path")
-        
-        for song in songs:
-            duration = str(song[4]) if song[4] else "N/A"
-            table.add_row(str(song[0]), song[1], song[2], song[3], duration, song[5])
-        console.print(table)
-    except psycopg2.Error as e:
+        with open(csv_path, newline="") as f, db_cursor(commit=True) as cur:
+            cur.copy_expert("""
+                COPY songs (title, album_id, duration, file_path)
+                FROM STDIN WITH CSV
+            """, f)
+        console.print(f"[green]Songs imported from '{csv_path}' successfully![/green]")
+    except OSError as e:
         console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
 
+# Songs are listed a page at a time; ordering by (title, id) matches
+# idx_songs_title, so each page is read off the index instead of sorting
+# the whole library
+SONGS_PAGE_SIZE = 200
+SONGS_SQL = """
+    SELECT s.id, s.title, al.title, ar.name, s.duration, s.file_path
+    FROM songs s
+    JOIN albums al ON s.album_id = al.id
+    JOIN artists ar ON al.artist_id = ar.id
+    ORDER BY s.title, s.id
+    LIMIT %s OFFSET %s;
+"""
+        
+SONG_COLUMNS = (
+    Column("ID", justify="right"),
+    Column("Title"),
+    Column("Album"),
+    Column("Artist"),
+    Column("Duration (sec)"),
+    Column("File Path"),
+)
+        
+@db_op
+def show_songs(cur=None, page=0):
+    table = _listing(f"🎵 Songs (page {page + 1})", SONG_COLUMNS)
+
+    songs = cached_fetchall(SONGS_SQL, (SONGS_PAGE_SIZE, page * SONGS_PAGE_SIZE), cur=cur)
+    add_row = table.add_row
+    for song in songs:
+        add_row(*map(_fmt, song))
+    console.print(table)
+    # A full page means there may be more songs after it
+    return len(songs) == SONGS_PAGE_SIZE
+
+def browse_songs(cur=None):
+    # Also used wherever a song ID is asked for, so every song stays reachable
+    page = 0
+    while show_songs(cur, page=page) and Confirm.ask("Show next page?"):
+        page += 1
+
+@db_op
 def update_song():
-    show_songs()
-    song_id = Prompt.ask("Enter ID of song to update")
+    song_id = pick(browse_songs, "Enter ID of song to update")
+    if song_id is None:
+        return
     
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
+    with db_cursor(commit=True) as cur:
         # Get current song data
         cur.execute("""
-            SELECT s.title, s.album_id, al.title, s.duration, s.file_path 
+            SELECT s.title, s.album_id, al.title, s.duration, s.file_path
             FROM songs s
             JOIN albums al ON s.album_id = al.id
             WHERE s.id = %s;
@@ -707,150 +904,111 @@ def update_song():
         
         # Show albums and allow change
         show_albums()
-        album_id = Prompt.ask(
-            f"Enter new album ID (current: {current_album_id} - {current_album_title})", 
+        album_id = ask_int(
+            f"Enter new album ID (current: {current_album_id} - {current_album_title})",
             default=str(current_album_id))
+        if album_id is None:
+            return
         
         duration = Prompt.ask(
-            f"Enter new duration in seconds (current: {current_duration if current_duration else 'N/A'})", 
+            f"Enter new duration in seconds (current: {current_duration if current_duration else 'N/A'})",
             default=str(current_duration) if current_duration else "0")
         
         file_path = Prompt.ask(
-            f"Enter new file path (current: {current_file_path})", 
+            f"Enter new file path (current: {current_file_path})",
             default=current_file_path)
         
-        cur.execute("""
-            UPDATE songs 
-            SET title = %s, album_id = %s, duration = %s, file_path = %s
-            WHERE id = %s;
+        execute_prepared(cur, "upd_song", """
+            UPDATE songs
+            SET title = $1, album_id = $2, duration = $3, file_path = $4
+            WHERE id = $5
         """, (title, album_id, int(duration), file_path, song_id))
+    console.print(f"[green]Song {song_id} updated successfully![/green]")
             
-        conn.commit()
-        console.print(f"[green]Song {song_id} updated successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
-
+@db_op
 def delete_song():
-    show_songs()
-    song_id = Prompt.ask("Enter ID of song to delete")
+    song_id = pick(browse_songs, "Enter ID of song to delete")
+    if song_id is None:
+        return
     
     if not Confirm.ask(f"[red]Are you sure you want to delete song {song_id}?[/red]"):
         return
         
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
-        # First delete dependent records
-        cur.execute("DELETE FROM playlist_songs WHERE song_id = %s;", (song_id,))
-        cur.execute("DELETE FROM play_history WHERE song_id = %s;", (song_id,))
-        cur.execute("DELETE FROM song_ratings WHERE song_id = %s;", (song_id,))
-        
-        # Then delete the song
+    with db_cursor(autocommit=True) as cur:
+        # Dependent records are removed by ON DELETE CASCADE within
+        # this one statement
         cur.execute("DELETE FROM songs WHERE id = %s;", (song_id,))
-        conn.commit()
+        deleted = cur.rowcount
         
-        if cur.rowcount > 0:
-            console.print(f"[green]Song {song_id} deleted successfully![/green]")
-        else:
-            console.print("[red]Song not found![/red]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-        conn.rollback()
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    if deleted > 0:
+        console.print(f"[green]Song {song_id} deleted successfully![/green]")
+    else:
+        console.print("[red]Song not found![/red]")
 
 # ========== PLAYLIST CRUD ==========
-def manage_playlists():
-    while True:
-        table = Table(title="📋 Playlist Management")
-        table.add_column("Option", style="cyan")
-        table.add_column("Action", style="magenta")
-        table.add_row("1", "Add Playlist")
-        table.add_row("2", "View All Playlists")
-        table.add_row("3", "Update Playlist")
-        table.add_row("4", "Delete Playlist")
-        table.add_row("5", "Back to Main Menu")
-        console.print(table)
-        
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4", "5"])
-        
-        if choice == "1":
-            add_playlist()
-        elif choice == "2":
-            show_playlists()
-        elif choice == "3":
-            update_playlist()
-        elif choice == "4":
-            delete_playlist()
-        elif choice == "5":
-            break
+PLAYLIST_MENU = _build_menu("📋 Playlist Management", [
+    ("1", "Add Playlist"),
+    ("2", "View All Playlists"),
+    ("3", "Update Playlist"),
+    ("4", "Delete Playlist"),
+    ("5", "Back to Main Menu")
+])
 
+def manage_playlists():
+    run_menu(PLAYLIST_MENU, CHOOSE_1_5, {
+        "1": add_playlist,
+        "2": show_playlists,
+        "3": update_playlist,
+        "4": delete_playlist,
+    })
+        
+@db_op
 def add_playlist():
     show_users()
-    user_id = Prompt.ask("Enter user ID for the playlist")
+    user_id = ask_int("Enter user ID for the playlist")
+    if user_id is None:
+        return
     name = Prompt.ask("Enter playlist name")
     
-    try:
-        conn = connect()
-        cur = conn.cursor()
+    with db_cursor(commit=True) as cur:
         cur.execute("""
             INSERT INTO playlists (name, user_id)
             VALUES (%s, %s);
         """, (name, user_id))
-        conn.commit()
-        console.print(f"[green]Playlist '{name}' added successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    console.print(f"[green]Playlist '{name}' added successfully![/green]")
 
-def show_playlists():
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT p.id, p.name, u.username 
-            FROM playlists p
-            JOIN users u ON p.user_id = u.id
-            ORDER BY p.name;
-        """)
-        playlists = cur.fetchall()
-        
-        table = Table(title="📋 Playlists")
-        table.add_column("ID", justify="right")
-        table.add_column("Name")
-        table.add_column("Owner")
-        
-        for playlist in playlists:
-            table.add_row(str(playlist[0]), playlist[1], playlist[2])
-        console.print(table)
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+PLAYLIST_COLUMNS = (
+    Column("ID", justify="right"),
+    Column("Name"),
+    Column("Owner"),
+)
+        
+@db_op
+def show_playlists(cur=None):
+    playlists = cached_fetchall("""
+        SELECT p.id, p.name, u.username
+        FROM playlists p
+        JOIN users u ON p.user_id = u.id
+        ORDER BY p.name;
+    """, cur=cur)
+        
+    table = _listing("📋 Playlists", PLAYLIST_COLUMNS)
 
+    add_row = table.add_row
+    for playlist in playlists:
+        add_row(*map(_fmt, playlist))
+    console.print(table)
+
+@db_op
 def update_playlist():
-    show_playlists()
-    playlist_id = Prompt.ask("Enter ID of playlist to update")
+    playlist_id = pick(show_playlists, "Enter ID of playlist to update")
+    if playlist_id is None:
+        return
     
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
+    with db_cursor(commit=True) as cur:
         # Get current playlist data
         cur.execute("""
-            SELECT p.name, p.user_id, u.username 
+            SELECT p.name, p.user_id, u.username
             FROM playlists p
             JOIN users u ON p.user_id = u.id
             WHERE p.id = %s;
@@ -867,199 +1025,201 @@ def update_playlist():
         
         # Show users and allow change
         show_users()
-        user_id = Prompt.ask(
-            f"Enter new user ID (current: {current_user_id} - {current_username})", 
+        user_id = ask_int(
+            f"Enter new user ID (current: {current_user_id} - {current_username})",
             default=str(current_user_id))
+        if user_id is None:
+            return
         
-        cur.execute("""
-            UPDATE playlists 
-            SET name = %s, user_id = %s
-            WHERE id = %s;
+        execute_prepared(cur, "upd_playlist", """
+            UPDATE playlists
+            SET name = $1, user_id = $2
+            WHERE id = $3
         """, (name, user_id, playlist_id))
+    console.print(f"[green]Playlist {playlist_id} updated successfully![/green]")
             
-        conn.commit()
-        console.print(f"[green]Playlist {playlist_id} updated successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
-
+@db_op
 def delete_playlist():
-    show_playlists()
-    playlist_id = Prompt.ask("Enter ID of playlist to delete")
+    playlist_id = pick(show_playlists, "Enter ID of playlist to delete")
+    if playlist_id is None:
+        return
     
     if not Confirm.ask(f"[red]Are you sure you want to delete playlist {playlist_id}?[/red]"):
         return
         
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
-        # First delete dependent records
-        cur.execute("DELETE FROM playlist_songs WHERE playlist_id = %s;", (playlist_id,))
-        
-        # Then delete the playlist
+    with db_cursor(autocommit=True) as cur:
+        # Dependent records are removed by ON DELETE CASCADE within
+        # this one statement
         cur.execute("DELETE FROM playlists WHERE id = %s;", (playlist_id,))
-        conn.commit()
+        deleted = cur.rowcount
         
-        if cur.rowcount > 0:
-            console.print(f"[green]Playlist {playlist_id} deleted successfully![/green]")
-        else:
-            console.print("[red]Playlist not found![/red]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-        conn.rollback()
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    if deleted > 0:
+        console.print(f"[green]Playlist {playlist_id} deleted successfully![/green]")
+    else:
+        console.print("[red]Playlist not found![/red]")
 
 # ========== PLAYLIST SONGS CRUD ==========
+PLAYLIST_SONGS_MENU = _build_menu("🎶 Playlist Songs Management", [
+    ("1", "Add Song to Playlist"),
+    ("2", "View Songs in Playlist"),
+    ("3", "Remove Song from Playlist"),
+    ("4", "Back to Main Menu")
+])
+
 def manage_playlist_songs():
-    while True:
-        table = Table(title="🎶 Playlist Songs Management")
-        table.add_column("Option", style="cyan")
-        table.add_column("Action", style="magenta")
-        table.add_row("1", "Add Song to Playlist")
-        table.add_row("2", "View Songs in Playlist")
-        table.add_row("3", "Remove Song from Playlist")
-        table.add_row("4", "Back to Main Menu")
-        console.print(table)
-        
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4"])
-        
-        if choice == "1":
-            add_song_to_playlist()
-        elif choice == "2":
-            show_playlist_songs()
-        elif choice == "3":
-            remove_song_from_playlist()
-        elif choice == "4":
-            break
+    run_menu(PLAYLIST_SONGS_MENU, CHOOSE_1_4, {
+        "1": add_song_to_playlist,
+        "2": show_playlist_songs,
+        "3": remove_song_from_playlist,
+    })
 
+@db_op
 def add_song_to_playlist():
+    prefetch(SONGS_SQL, (SONGS_PAGE_SIZE, 0))
     show_playlists()
-    playlist_id = Prompt.ask("Enter playlist ID")
-    show_songs()
-    song_id = Prompt.ask("Enter song ID to add")
-    
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
+    playlist_id = ask_int("Enter playlist ID")
+    if playlist_id is None:
+        return
+    browse_songs()
+    song_id = Prompt.ask("Enter song ID to add (comma-separated for several)")
+
+    if "," in song_id:
+        song_ids = [_as_int(s) for s in song_id.split(",") if s.strip()]
+        if None in song_ids:
+            return
+        added = bulk_add_songs_to_playlist(playlist_id, song_ids)
+        console.print(f"[green]{added} of {len(song_ids)} songs added to playlist {playlist_id}![/green]")
+        return
+
+    song_id = _as_int(song_id)
+    if song_id is None:
+        return
+
+    with db_cursor(commit=True) as cur:
+        execute_prepared(cur, "ins_playlist_song", """
             INSERT INTO playlist_songs (playlist_id, song_id)
-            VALUES (%s, %s)
-            ON CONFLICT (playlist_id, song_id) DO NOTHING;
+            VALUES ($1, $2)
+            ON CONFLICT (playlist_id, song_id) DO NOTHING
         """, (playlist_id, song_id))
-        conn.commit()
-        
-        if cur.rowcount > 0:
-            console.print(f"[green]Song {song_id} added to playlist {playlist_id} successfully![/green]")
-        else:
-            console.print("[yellow]Song already exists in this playlist![/yellow]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+        added = cur.rowcount
 
-def show_playlist_songs():
-    show_playlists()
-    playlist_id = Prompt.ask("Enter playlist ID to view songs")
-    
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
-        # Get playlist info
-        cur.execute("""
-            SELECT p.name, u.username 
-            FROM playlists p
-            JOIN users u ON p.user_id = u.id
-            WHERE p.id = %s;
-        """, (playlist_id,))
-        playlist_info = cur.fetchone()
+    if added > 0:
+        console.print(f"[green]Song {song_id} added to playlist {playlist_id} successfully![/green]")
+    else:
+        console.print("[yellow]Song already exists in this playlist![/yellow]")
+
+def bulk_add_songs_to_playlist(playlist_id, song_ids):
+    # One multi-row INSERT per 1000 songs; songs already in the playlist are
+    # skipped, and the number actually added is returned
+    with db_cursor(commit=True) as cur:
+        added = execute_values(cur, """
+            INSERT INTO playlist_songs (playlist_id, song_id)
+            VALUES %s
+            ON CONFLICT (playlist_id, song_id) DO NOTHING
+            RETURNING song_id;
+        """, [(playlist_id, song_id) for song_id in song_ids], page_size=1000, fetch=True)
+    return len(added)
+
+PLAYLIST_SONG_COLUMNS = (
+    Column("ID", justify="right"),
+    Column("Title"),
+    Column("Album"),
+    Column("Artist"),
+    Column("Added At"),
+)
+
+@db_op
+def show_playlist_songs(cur=None, playlist_id=None):
+    # Callers that already hold a cursor pass it in, along with the
+    # playlist they have chosen
+    with nullcontext(cur) if cur else db_cursor() as cur:
+        if playlist_id is None:
+            show_playlists(cur)
+            playlist_id = ask_int("Enter playlist ID to view songs")
+            if playlist_id is None:
+                return
+
+        # Playlist info and its songs come back in one query, streamed
+        # through a server-side cursor on the same connection. The outer
+        # join yields a single all-NULL song row for an empty playlist
+        with cur.connection.cursor(name="playlist_songs") as songs:
+            songs.itersize = 2000
+            songs.execute("""
+                SELECT p.name, u.username, s.id, s.title, al.title, ar.name, ps.added_at
+                FROM playlists p
+                JOIN users u ON p.user_id = u.id
+                LEFT JOIN (playlist_songs ps
+                           JOIN songs s ON ps.song_id = s.id
+                           JOIN albums al ON s.album_id = al.id
+                           JOIN artists ar ON al.artist_id = ar.id)
+                    ON ps.playlist_id = p.id
+                WHERE p.id = %s
+                ORDER BY ps.added_at;
+            """, (playlist_id,))
+            first = songs.fetchone()
+
+            if not first:
+                console.print("[red]Playlist not found![/red]")
+                return
+
+            playlist_name, username = first[:2]
+
+            table = _listing(f"🎶 Songs in Playlist: {playlist_name} (Owner: {username})", PLAYLIST_SONG_COLUMNS)
+
+            add_row = table.add_row
+            for song in chain((first,), songs):
+                if song[2] is not None:
+                    add_row(str(song[2]), song[3], song[4], song[5], str(song[6]))
+        console.print(table)
         
-        if not playlist_info:
-            console.print("[red]Playlist not found![/red]")
+@db_op
+def remove_song_from_playlist():
+    # Both listings and the delete share one connection
+    with db_cursor(commit=True) as cur:
+        show_playlists(cur)
+        playlist_id = ask_int("Enter playlist ID")
+        if playlist_id is None:
+            return
+        show_playlist_songs(cur, playlist_id)
+        song_id = ask_int("Enter song ID to remove")
+        if song_id is None:
             return
             
-        playlist_name, username = playlist_info
-        
-        # Get songs in playlist
-        cur.execute("""
-            SELECT s.id, s.title, al.title, ar.name, ps.added_at 
-            FROM playlist_songs ps
-            JOIN songs s ON ps.song_id = s.id
-            JOIN albums al ON s.album_id = al.id
-            JOIN artists ar ON al.artist_id = ar.id
-            WHERE ps.playlist_id = %s
-            ORDER BY ps.added_at;
-        """, (playlist_id,))
-        songs = cur.fetchall()
-        
-        table = Table(title=f"🎶 Songs in Playlist: {playlist_name} (Owner: {username})")
-        table.add_column("ID", justify="right")
-        table.add_column("Title")
-        table.add_column("Album")
-        table.add_column("Artist")
-        table.add_column("Added At")
-        
-        for song in songs:
-            table.add_row(str(song[0]), song[1], song[2], song[3], str(song[4]))
-        console.print(table)
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
-
-def remove_song_from_playlist():
-    show_playlists()
-    playlist_id = Prompt.ask("Enter playlist ID")
-    show_playlist_songs()
-    song_id = Prompt.ask("Enter song ID to remove")
-    
-    if not Confirm.ask(f"[red]Are you sure you want to remove song {song_id} from playlist {playlist_id}?[/red]"):
-        return
+        if not Confirm.ask(f"[red]Are you sure you want to remove song {song_id} from playlist {playlist_id}?[/red]"):
+            return
         
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
-            DELETE FROM playlist_songs 
-            WHERE playlist_id = %s AND song_id = %s;
+        execute_prepared(cur, "del_playlist_song", """
+            DELETE FROM playlist_songs
+            WHERE playlist_id = $1 AND song_id = $2
+            RETURNING song_id
         """, (playlist_id, song_id))
-        conn.commit()
+        deleted = cur.fetchone()
+        
+    if deleted:
+        console.print(f"[green]Song {song_id} removed from playlist {playlist_id} successfully![/green]")
+    else:
+        console.print("[red]Song not found in this playlist![/red]")
         
-        if cur.rowcount > 0:
-            console.print(f"[green]Song {song_id} removed from playlist {playlist_id} successfully![/green]")
-        else:
-            console.print("[red]Song not found in this playlist![/red]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
-
 # ========== PLAY HISTORY ==========
+PLAY_HISTORY_COLUMNS = (
+    Column("ID", justify="right"),
+    Column("Song"),
+    Column("User"),
+    Column("Played At"),
+)
+
+@db_op
 def view_play_history():
     show_users()
-    user_id = Prompt.ask("Enter user ID to view play history", default="")
-    
-    try:
-        conn = connect()
-        cur = conn.cursor()
+    user_id = ask_int("Enter user ID to view play history", default="")
+    if user_id is None:
+        return
         
+    with db_cursor(name="play_history") as cur:
         if user_id:
             # Get play history for specific user
             cur.execute("""
-                SELECT ph.id, s.title, u.username, ph.played_at 
+                SELECT ph.id, s.title, u.username, ph.played_at
                 FROM play_history ph
                 JOIN songs s ON ph.song_id = s.id
                 JOIN users u ON ph.user_id = u.id
@@ -1070,7 +1230,7 @@ def view_play_history():
         else:
             # Get all play history
             cur.execute("""
-                SELECT ph.id, s.title, u.username, ph.played_at 
+                SELECT ph.id, s.title, u.username, ph.played_at
                 FROM play_history ph
                 JOIN songs s ON ph.song_id = s.id
                 JOIN users u ON ph.user_id = u.id
@@ -1078,86 +1238,79 @@ def view_play_history():
             """)
             title = "All Play History"
         
-        history = cur.fetchall()
+        table = _listing(f"⏳ {title}", PLAY_HISTORY_COLUMNS)
         
-        table = Table(title=f"⏳ {title}")
-        table.add_column("ID", justify="right")
-        table.add_column("Song")
-        table.add_column("User")
-        table.add_column("Played At")
-        
-        for item in history:
-            table.add_row(str(item[0]), item[1], item[2], str(item[3]))
+        add_row = table.add_row
+        for item in cur:
+            add_row(str(item[0]), item[1], item[2], str(item[3]))
         console.print(table)
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
 
 # ========== SONG RATINGS ==========
-def manage_song_ratings():
-    while True:
-        table = Table(title="⭐ Song Ratings Management")
-        table.add_column("Option", style="cyan")
-        table.add_column("Action", style="magenta")
-        table.add_row("1", "Add/Update Rating")
-        table.add_row("2", "View Ratings")
-        table.add_row("3", "Delete Rating")
-        table.add_row("4", "Back to Main Menu")
-        console.print(table)
-        
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4"])
-        
-        if choice == "1":
-            add_update_rating()
-        elif choice == "2":
-            show_ratings()
-        elif choice == "3":
-            delete_rating()
-        elif choice == "4":
-            break
+RATING_MENU = _build_menu("⭐ Song Ratings Management", [
+    ("1", "Add/Update Rating"),
+    ("2", "View Ratings"),
+    ("3", "Delete Rating"),
+    ("4", "Discard Pending Changes"),
+    ("5", "Back to Main Menu")
+])
 
-def add_update_rating():
+def manage_song_ratings():
+    # Changes made from this menu share one transaction that is committed
+    # on leaving it, so a run of edits costs a single commit
+    with menu_batch() as cur:
+        run_menu(RATING_MENU, CHOOSE_1_5, {
+            "1": lambda: add_update_rating(cur),
+            "2": lambda: show_ratings(cur),
+            "3": lambda: delete_rating(cur),
+            "4": lambda: discard_batch(cur, "rating"),
+        })
+        
+@db_op
+def add_update_rating(cur=None):
+    prefetch(SONGS_SQL, (SONGS_PAGE_SIZE, 0))
     show_users()
-    user_id = Prompt.ask("Enter user ID")
-    show_songs()
-    song_id = Prompt.ask("Enter song ID")
-    rating = Prompt.ask("Enter rating (1-5)", choices=["1", "2", "3", "4", "5"])
-    
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
+    user_id = ask_int("Enter user ID")
+    if user_id is None:
+        return
+    browse_songs()
+    song_id = ask_int("Enter song ID")
+    if song_id is None:
+        return
+    rating = int(Prompt.ask("Enter rating (1-5)", choices=["1", "2", "3", "4", "5"]))
+
+    with batch_step(cur) as cur:
+        execute_prepared(cur, "upsert_rating", """
             INSERT INTO song_ratings (user_id, song_id, rating)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (user_id, song_id) 
-            DO UPDATE SET rating = EXCLUDED.rating;
+            VALUES ($1, $2, $3)
+            ON CONFLICT (user_id, song_id)
+            DO UPDATE SET rating = EXCLUDED.rating
         """, (user_id, song_id, rating))
-        conn.commit()
-        console.print(f"[green]Rating {rating} added/updated for song {song_id} by user {user_id}![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    console.print(f"[green]Rating {rating} added/updated for song {song_id} by user {user_id}![/green]")
+
+RATING_COLUMNS = (
+    Column("User"),
+    Column("Song"),
+    Column("Rating"),
+)
 
-def show_ratings():
+@db_op
+def show_ratings(cur=None):
+    prefetch(SONGS_SQL, (SONGS_PAGE_SIZE, 0))
     show_users()
-    user_id = Prompt.ask("Enter user ID to filter (leave blank for all)", default="")
-    show_songs()
-    song_id = Prompt.ask("Enter song ID to filter (leave blank for all)", default="")
+    user_id = ask_int("Enter user ID to filter (leave blank for all)", default="")
+    if user_id is None:
+        return
+    browse_songs()
+    song_id = ask_int("Enter song ID to filter (leave blank for all)", default="")
+    if song_id is None:
+        return
     
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        
+    # Outside a batch this only reads, so it needs no COMMIT
+    with batch_step(cur) if cur else db_cursor() as cur, cur.connection.cursor(name="ratings") as rows:
         if user_id and song_id:
             # Get specific rating
-            cur.execute("""
-                SELECT u.username, s.title, sr.rating 
+            rows.execute("""
+                SELECT u.username, s.title, repeat('★', sr.rating) || repeat('☆', 5 - sr.rating)
                 FROM song_ratings sr
                 JOIN users u ON sr.user_id = u.id
                 JOIN songs s ON sr.song_id = s.id
@@ -1166,8 +1319,8 @@ def show_ratings():
             title = f"Rating for Song {song_id} by User {user_id}"
         elif user_id:
             # Get all ratings by user
-            cur.execute("""
-                SELECT u.username, s.title, sr.rating 
+            rows.execute("""
+                SELECT u.username, s.title, repeat('★', sr.rating) || repeat('☆', 5 - sr.rating)
                 FROM song_ratings sr
                 JOIN users u ON sr.user_id = u.id
                 JOIN songs s ON sr.song_id = s.id
@@ -1177,8 +1330,8 @@ def show_ratings():
             title = f"All Ratings by User {user_id}"
         elif song_id:
             # Get all ratings for song
-            cur.execute("""
-                SELECT u.username, s.title, sr.rating 
+            rows.execute("""
+                SELECT u.username, s.title, repeat('★', sr.rating) || repeat('☆', 5 - sr.rating)
                 FROM song_ratings sr
                 JOIN users u ON sr.user_id = u.id
                 JOIN songs s ON sr.song_id = s.id
@@ -1188,8 +1341,8 @@ def show_ratings():
             title = f"All Ratings for Song {song_id}"
         else:
             # Get all ratings
-            cur.execute("""
-                SELECT u.username, s.title, sr.rating 
+            rows.execute("""
+                SELECT u.username, s.title, repeat('★', sr.rating) || repeat('☆', 5 - sr.rating)
                 FROM song_ratings sr
                 JOIN users u ON sr.user_id = u.id
                 JOIN songs s ON sr.song_id = s.id
@@ -1197,109 +1350,101 @@ def show_ratings():
             """)
             title = "All Song Ratings"
         
-        ratings = cur.fetchall()
-        
-        table = Table(title=f"⭐ {title}")
-        table.add_column("User")
-        table.add_column("Song")
-        table.add_column("Rating")
+        table = _listing(f"⭐ {title}", RATING_COLUMNS)
         
-        for item in ratings:
-            # Add star emojis based on rating
-            stars = "★" * int(item[2]) + "☆" * (5 - int(item[2]))
-            table.add_row(item[0], item[1], stars)
+        # The star string is rendered by PostgreSQL
+        add_row = table.add_row
+        for item in rows:
+            add_row(*item)
         console.print(table)
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
-
-def delete_rating():
+        
+@db_op
+def delete_rating(cur=None):
+    prefetch(SONGS_SQL, (SONGS_PAGE_SIZE, 0))
     show_users()
-    user_id = Prompt.ask("Enter user ID")
-    show_songs()
-    song_id = Prompt.ask("Enter song ID")
+    user_id = ask_int("Enter user ID")
+    if user_id is None:
+        return
+    browse_songs()
+    song_id = ask_int("Enter song ID")
+    if song_id is None:
+        return
     
     if not Confirm.ask(f"[red]Are you sure you want to delete rating for song {song_id} by user {user_id}?[/red]"):
         return
         
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
-            DELETE FROM song_ratings 
-            WHERE user_id = %s AND song_id = %s;
+    with batch_step(cur) as cur:
+        execute_prepared(cur, "del_rating", """
+            DELETE FROM song_ratings
+            WHERE user_id = $1 AND song_id = $2
+            RETURNING rating
         """, (user_id, song_id))
-        conn.commit()
+        deleted = cur.fetchone()
         
-        if cur.rowcount > 0:
-            console.print(f"[green]Rating for song {song_id} by user {user_id} deleted successfully![/green]")
-        else:
-            console.print("[red]Rating not found![/red]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    if deleted:
+        console.print(f"[green]Rating {deleted[0]} for song {song_id} by user {user_id} deleted successfully![/green]")
+    else:
+        console.print("[red]Rating not found![/red]")
 
 # ========== SONG LIKES ==========
-def manage_song_likes():
-    while True:
-        table = Table(title="👍 Song Likes Management")
-        table.add_column("Option", style="cyan")
-        table.add_column("Action", style="magenta")
-        table.add_row("1", "Add Like")
-        table.add_row("2", "Show Likes")
-        table.add_row("3", "Delete Like")
-        table.add_row("4", "Back to Main Menu")
-        console.print(table)
+LIKE_MENU = _build_menu("👍 Song Likes Management", [
+    ("1", "Add Like"),
+    ("2", "Show Likes"),
+    ("3", "Delete Like"),
+    ("4", "Discard Pending Changes"),
+    ("5", "Back to Main Menu")
+])
 
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4"])
-        if choice == "1":
-            add_song_like()
-        elif choice == "2":
-            show_song_likes()
-        elif choice == "3":
-            delete_song_like()
-        elif choice == "4":
-            break
+def manage_song_likes():
+    # Changes made from this menu share one transaction that is committed
+    # on leaving it, so a run of edits costs a single commit
+    with menu_batch() as cur:
+        run_menu(LIKE_MENU, CHOOSE_1_5, {
+            "1": lambda: add_song_like(cur),
+            "2": lambda: show_song_likes(cur),
+            "3": lambda: delete_song_like(cur),
+            "4": lambda: discard_batch(cur, "like"),
+        })
 
-def add_song_like():
+@db_op
+def add_song_like(cur=None):
+    prefetch(SONGS_SQL, (SONGS_PAGE_SIZE, 0))
     show_users()
-    user_id = Prompt.ask("Enter user ID")
-    show_songs()
-    song_id = Prompt.ask("Enter song ID")
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
+    user_id = ask_int("Enter user ID")
+    if user_id is None:
+        return
+    browse_songs()
+    song_id = ask_int("Enter song ID")
+    if song_id is None:
+        return
+    with batch_step(cur) as cur:
+        execute_prepared(cur, "ins_like", """
             INSERT INTO song_likes (user_id, song_id)
-            VALUES (%s, %s)
-            ON CONFLICT (user_id, song_id) DO NOTHING;
+            VALUES ($1, $2)
+            ON CONFLICT (user_id, song_id) DO NOTHING
         """, (user_id, song_id))
-        conn.commit()
-        if cur.rowcount > 0:
-            console.print(f"[green]Like added successfully![/green]")
-        else:
-            console.print("[yellow]User already liked this song![/yellow]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+        added = cur.rowcount
+    if added > 0:
+        console.print(f"[green]Like added successfully![/green]")
+    else:
+        console.print("[yellow]User already liked this song![/yellow]")
 
-def show_song_likes():
-    show_songs()
-    song_id = Prompt.ask("Enter song ID to show likes (leave blank for all)", default="")
-    try:
-        conn = connect()
-        cur = conn.cursor()
+LIKE_COLUMNS = (
+    Column("User"),
+    Column("Song"),
+    Column("Liked At"),
+)
+
+@db_op
+def show_song_likes(cur=None):
+    browse_songs()
+    song_id = ask_int("Enter song ID to show likes (leave blank for all)", default="")
+    if song_id is None:
+        return
+    # Outside a batch this only reads, so it needs no COMMIT
+    with batch_step(cur) if cur else db_cursor() as cur, cur.connection.cursor(name="song_likes") as rows:
         if song_id:
-            cur.execute("""
+            rows.execute("""
                 SELECT u.username, s.title, sl.liked_at
                 FROM song_likes sl
                 JOIN users u ON sl.user_id = u.id
@@ -1309,7 +1454,7 @@ def show_song_likes():
             """, (song_id,))
             title = f"Likes for Song {song_id}"
         else:
-            cur.execute("""
+            rows.execute("""
                 SELECT u.username, s.title, sl.liked_at
                 FROM song_likes sl
                 JOIN users u ON sl.user_id = u.id
@@ -1317,97 +1462,85 @@ def show_song_likes():
                 ORDER BY sl.liked_at DESC
             """)
             title = "All Song Likes"
-        likes = cur.fetchall()
-        table = Table(title=title)
-        table.add_column("User")
-        table.add_column("Song")
-        table.add_column("Liked At")
-        for l in likes:
-            table.add_row(l[0], l[1], str(l[2]))
+
+        table = _listing(title, LIKE_COLUMNS)
+        add_row = table.add_row
+        for l in rows:
+            add_row(l[0], l[1], str(l[2]))
         console.print(table)
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
 
-def delete_song_like():
+@db_op
+def delete_song_like(cur=None):
+    prefetch(SONGS_SQL, (SONGS_PAGE_SIZE, 0))
     show_users()
-    user_id = Prompt.ask("Enter user ID")
-    show_songs()
-    song_id = Prompt.ask("Enter song ID")
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
-            DELETE FROM song_likes WHERE user_id=%s AND song_id=%s
+    user_id = ask_int("Enter user ID")
+    if user_id is None:
+        return
+    browse_songs()
+    song_id = ask_int("Enter song ID")
+    if song_id is None:
+        return
+    with batch_step(cur) as cur:
+        execute_prepared(cur, "del_like", """
+            DELETE FROM song_likes WHERE user_id=$1 AND song_id=$2 RETURNING song_id
         """, (user_id, song_id))
-        conn.commit()
-        if cur.rowcount > 0:
-            console.print(f"[green]Like deleted successfully![/green]")
-        else:
-            console.print("[red]Like not found![/red]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+        deleted = cur.fetchone()
+    if deleted:
+        console.print(f"[green]Like deleted successfully![/green]")
+    else:
+        console.print("[red]Like not found![/red]")
 
 # ========== ARTIST FOLLOWS ==========
-def manage_artist_follows():
-    while True:
-        table = Table(title="👤 Artist Follows Management")
-        table.add_column("Option", style="cyan")
-        table.add_column("Action", style="magenta")
-        table.add_row("1", "Follow Artist")
-        table.add_row("2", "Show Follows")
-        table.add_row("3", "Unfollow Artist")
-        table.add_row("4", "Back to Main Menu")
-        console.print(table)
+FOLLOW_MENU = _build_menu("👤 Artist Follows Management", [
+    ("1", "Follow Artist"),
+    ("2", "Show Follows"),
+    ("3", "Unfollow Artist"),
+    ("4", "Back to Main Menu")
+])
 
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4"])
-        if choice == "1":
-            add_artist_follow()
-        elif choice == "2":
-            show_artist_follows()
-        elif choice == "3":
-            delete_artist_follow()
-        elif choice == "4":
-            break
+def manage_artist_follows():
+    run_menu(FOLLOW_MENU, CHOOSE_1_4, {
+        "1": add_artist_follow,
+        "2": show_artist_follows,
+        "3": delete_artist_follow,
+    })
 
+@db_op
 def add_artist_follow():
+    prefetch(ARTISTS_SQL)
     show_users()
-    user_id = Prompt.ask("Enter user ID")
+    user_id = ask_int("Enter user ID")
+    if user_id is None:
+        return
     show_artists()
-    artist_id = Prompt.ask("Enter artist ID")
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
+    artist_id = ask_int("Enter artist ID")
+    if artist_id is None:
+        return
+    with db_cursor(commit=True) as cur:
+        execute_prepared(cur, "ins_follow", """
             INSERT INTO artist_follows (user_id, artist_id)
-            VALUES (%s, %s)
-            ON CONFLICT (user_id, artist_id) DO NOTHING;
+            VALUES ($1, $2)
+            ON CONFLICT (user_id, artist_id) DO NOTHING
         """, (user_id, artist_id))
-        conn.commit()
-        if cur.rowcount > 0:
-            console.print("[green]Artist followed successfully![/green]")
-        else:
-            console.print("[yellow]User already follows this artist![/yellow]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+        added = cur.rowcount
+    if added > 0:
+        console.print("[green]Artist followed successfully![/green]")
+    else:
+        console.print("[yellow]User already follows this artist![/yellow]")
+
+FOLLOW_COLUMNS = (
+    Column("User"),
+    Column("Artist"),
+    Column("Followed At"),
+)
 
+@db_op
 def show_artist_follows():
     show_users()
-    user_id = Prompt.ask("Enter user ID to show follows (leave blank for all)", default="")
-    try:
-        conn = connect()
-        cur = conn.cursor()
+    user_id = ask_int("Enter user ID to show follows (leave blank for all)", default="")
+    if user_id is None:
+        return
+    with db_cursor(name="artist_follows") as cur:
         if user_id:
             cur.execute("""
                 SELECT u.username, a.name, af.followed_at
@@ -1427,184 +1560,147 @@ def show_artist_follows():
                 ORDER BY af.followed_at DESC
             """)
             title = "All Artist Follows"
-        follows = cur.fetchall()
-        table = Table(title=title)
-        table.add_column("User")
-        table.add_column("Artist")
-        table.add_column("Followed At")
-        for f in follows:
-            table.add_row(f[0], f[1], str(f[2]))
+
+        table = _listing(title, FOLLOW_COLUMNS)
+        add_row = table.add_row
+        for f in cur:
+            add_row(f[0], f[1], str(f[2]))
         console.print(table)
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
 
+@db_op
 def delete_artist_follow():
+    prefetch(ARTISTS_SQL)
     show_users()
-    user_id = Prompt.ask("Enter user ID")
+    user_id = ask_int("Enter user ID")
+    if user_id is None:
+        return
     show_artists()
-    artist_id = Prompt.ask("Enter artist ID")
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
-            DELETE FROM artist_follows WHERE user_id=%s AND artist_id=%s
+    artist_id = ask_int("Enter artist ID")
+    if artist_id is None:
+        return
+    with db_cursor(commit=True) as cur:
+        execute_prepared(cur, "del_follow", """
+            DELETE FROM artist_follows WHERE user_id=$1 AND artist_id=$2 RETURNING artist_id
         """, (user_id, artist_id))
-        conn.commit()
-        if cur.rowcount > 0:
-            console.print("[green]Unfollowed successfully![/green]")
-        else:
-            console.print("[red]Follow not found![/red]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+        deleted = cur.fetchone()
+    if deleted:
+        console.print("[green]Unfollowed successfully![/green]")
+    else:
+        console.print("[red]Follow not found![/red]")
 
 # ========== SONG COMMENTS ==========
-def manage_song_comments():
-    while True:
-        table = Table(title="💬 Song Comments Management")
-        table.add_column("Option", style="cyan")
-        table.add_column("Action", style="magenta")
-        table.add_row("1", "Add Comment")
-        table.add_row("2", "Show Comments")
-        table.add_row("3", "Delete Comment")
-        table.add_row("4", "Back to Main Menu")
-        console.print(table)
+COMMENT_MENU = _build_menu("💬 Song Comments Management", [
+    ("1", "Add Comment"),
+    ("2", "Show Comments"),
+    ("3", "Delete Comment"),
+    ("4", "Back to Main Menu")
+])
 
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4"])
-        if choice == "1":
-            add_song_comment()
-        elif choice == "2":
-            show_song_comments()
-        elif choice == "3":
-            delete_song_comment()
-        elif choice == "4":
-            break
+def manage_song_comments():
+    run_menu(COMMENT_MENU, CHOOSE_1_4, {
+        "1": add_song_comment,
+        "2": show_song_comments,
+        "3": delete_song_comment,
+    })
 
+@db_op
 def add_song_comment():
+    prefetch(SONGS_SQL, (SONGS_PAGE_SIZE, 0))
     show_users()
-    user_id = Prompt.ask("Enter user ID")
-    show_songs()
-    song_id = Prompt.ask("Enter song ID")
+    user_id = ask_int("Enter user ID")
+    if user_id is None:
+        return
+    browse_songs()
+    song_id = ask_int("Enter song ID")
+    if song_id is None:
+        return
     comment = Prompt.ask("Enter comment text")
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
+    with db_cursor(commit=True) as cur:
+        execute_prepared(cur, "ins_comment", """
             INSERT INTO song_comments (user_id, song_id, comment)
-            VALUES (%s, %s, %s);
+            VALUES ($1, $2, $3)
         """, (user_id, song_id, comment))
-        conn.commit()
-        console.print("[green]Comment added successfully![/green]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+    console.print("[green]Comment added successfully![/green]")
 
-def show_song_comments():
-    show_songs()
-    song_id = Prompt.ask("Enter song ID to show comments (leave blank for all)", default="")
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        if song_id:
-            cur.execute("""
-                SELECT sc.id, u.username, s.title, sc.comment, sc.commented_at
-                FROM song_comments sc
-                JOIN users u ON sc.user_id = u.id
-                JOIN songs s ON sc.song_id = s.id
-                WHERE sc.song_id = %s
-                ORDER BY sc.commented_at DESC
-            """, (song_id,))
-            title = f"Comments for Song {song_id}"
-        else:
-            cur.execute("""
-                SELECT sc.id, u.username, s.title, sc.comment, sc.commented_at
-                FROM song_comments sc
-                JOIN users u ON sc.user_id = u.id
-                JOIN songs s ON sc.song_id = s.id
-                ORDER BY sc.commented_at DESC
-            """)
-            title = "All Song Comments"
-        comments = cur.fetchall()
-        table = Table(title=title)
-        table.add_column("ID")
-        table.add_column("User")
-        table.add_column("Song")
-        table.add_column("Comment")
-        table.add_column("Commented At")
-        for c in comments:
-            table.add_row(str(c[0]), c[1], c[2], c[3], str(c[4]))
+COMMENT_COLUMNS = (
+    Column("ID"),
+    Column("User"),
+    Column("Song"),
+    Column("Comment"),
+    Column("Commented At"),
+)
+
+@db_op
+def show_song_comments(cur=None):
+    with nullcontext(cur) if cur else db_cursor() as cur:
+        browse_songs(cur)
+        song_id = ask_int("Enter song ID to show comments (leave blank for all)", default="")
+        if song_id is None:
+            return
+        # Comments are streamed through a server-side cursor on the
+        # same connection
+        with cur.connection.cursor(name="song_comments") as comments:
+            comments.itersize = 2000
+            if song_id:
+                comments.execute("""
+                    SELECT sc.id, u.username, s.title, sc.comment, sc.commented_at
+                    FROM song_comments sc
+                    JOIN users u ON sc.user_id = u.id
+                    JOIN songs s ON sc.song_id = s.id
+                    WHERE sc.song_id = %s
+                    ORDER BY sc.commented_at DESC
+                """, (song_id,))
+                title = f"Comments for Song {song_id}"
+            else:
+                comments.execute("""
+                    SELECT sc.id, u.username, s.title, sc.comment, sc.commented_at
+                    FROM song_comments sc
+                    JOIN users u ON sc.user_id = u.id
+                    JOIN songs s ON sc.song_id = s.id
+                    ORDER BY sc.commented_at DESC
+                """)
+                title = "All Song Comments"
+            table = _listing(title, COMMENT_COLUMNS)
+            add_row = table.add_row
+            for c in comments:
+                add_row(str(c[0]), c[1], c[2], c[3], str(c[4]))
         console.print(table)
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
 
+@db_op
 def delete_song_comment():
-    show_song_comments()
-    comment_id = Prompt.ask("Enter comment ID to delete")
-    try:
-        conn = connect()
-        cur = conn.cursor()
-        cur.execute("""
-            DELETE FROM song_comments WHERE id=%s
+    # The listing and the delete share one connection
+    with db_cursor(commit=True) as cur:
+        show_song_comments(cur)
+        comment_id = ask_int("Enter comment ID to delete")
+        if comment_id is None:
+            return
+        execute_prepared(cur, "del_comment", """
+            DELETE FROM song_comments WHERE id=$1 RETURNING id
         """, (comment_id,))
-        conn.commit()
-        if cur.rowcount > 0:
-            console.print("[green]Comment deleted successfully![/green]")
-        else:
-            console.print("[red]Comment not found![/red]")
-    except psycopg2.Error as e:
-        console.print(f"[red]Error: {e}[/red]")
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+        deleted = cur.fetchone()
+    if deleted:
+        console.print("[green]Comment deleted successfully![/green]")
+    else:
+        console.print("[red]Comment not found![/red]")
 
 
 # ========== MAIN FUNCTION ==========
 def main():
-    while True:
-        menu()
-        choice = Prompt.ask("Choose an option", choices=[str(i) for i in range(13)])
-        if choice == "1":
-            manage_users()
-        elif choice == "2":
-            manage_artists()
-        elif choice == "3":
-            manage_albums()
-        elif choice == "4":
-            manage_songs()
-        elif choice == "5":
-            manage_playlists()
-        elif choice == "6":
-            manage_playlist_songs()
-        elif choice == "7":
-            view_play_history()
-        elif choice == "8":
-            manage_song_ratings()
-        elif choice == "9":
-            create_tables()
-        elif choice == "10":
-            manage_song_likes()
-        elif choice == "11":
-            manage_artist_follows()
-        elif choice == "12":
-            manage_song_comments()
-        elif choice == "0":
-            console.print("[yellow]Goodbye![/yellow]")
-            break
+    run_menu(MAIN_MENU, CHOOSE_MAIN, {
+        "1": manage_users,
+        "2": manage_artists,
+        "3": manage_albums,
+        "4": manage_songs,
+        "5": manage_playlists,
+        "6": manage_playlist_songs,
+        "7": view_play_history,
+        "8": manage_song_ratings,
+        "9": create_tables,
+        "10": manage_song_likes,
+        "11": manage_artist_follows,
+        "12": manage_song_comments,
+    })
+    console.print("[yellow]Goodbye![/yellow]")
 
 
 if __name__ == '__main__':